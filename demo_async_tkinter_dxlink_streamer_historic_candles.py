@@ -14,10 +14,26 @@ from tkinter import ttk
 import asyncio
 import json
 
+try:
+    import orjson  # optional, faster config parsing
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # optional, compiles vwap_append()
+except ImportError:
+    def njit(*_args, **_kwargs):
+        """ fallback if numba is not installed: run the function as plain Python """
+        return lambda func: func
+
 from datetime import datetime
+from dateutil.tz import tzlocal  # installed with pandas
+import numpy as np
 import pandas as pd
 
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.colors import to_rgba
+from matplotlib.path import Path
 import mplfinance as mpf
 
 from tastytrade import DXLinkStreamer
@@ -34,22 +50,43 @@ SNAPSHOT_END = 0x8
 SNAPSHOT_SNIP = 0x10
 SNAPSHOT_MODE = 0x40
 
+# number of candles kept, once reached the oldest candle is overwritten
+CANDLE_CAPACITY = 4096
+
+# float32 (~7 significant digits) is plenty for charting prices/volumes and halves the memory bandwidth of float64
+CANDLE_DTYPE = np.float32
+
+# Tk's mainloop runs the asyncio loop every PUMP_INTERVAL_MS milliseconds
+PUMP_INTERVAL_MS = 10
+ANIMATION_INTERVAL_MS = 100
+
+# candles received within this time (seconds) are coalesced into one graph update
+REDRAW_DELAY = 0.05
+
+# candle times are stored as UTC nanoseconds and displayed in local time (as datetime.fromtimestamp() would return),
+# tzlocal() follows the system zone's DST rules, unlike a fixed offset taken once at startup
+LOCAL_TZ = tzlocal()
+
+FLAG_NAMES = (
+    (TX_PENDING, 'TX_PENDING'),
+    (REMOVE_EVENT, 'REMOVE_EVENT'),
+    (SNAPSHOT_BEGIN, 'SNAPSHOT_BEGIN'),
+    (SNAPSHOT_END, 'SNAPSHOT_END'),
+    (SNAPSHOT_SNIP, 'SNAPSHOT_SNIP'),
+    (SNAPSHOT_MODE, 'SNAPSHOT_MODE'),
+)
+
+# flags which need special handling in get_candle_async, live candles usually have none of them set
+SNAPSHOT_MASK = SNAPSHOT_BEGIN | SNAPSHOT_END | REMOVE_EVENT
+
 def check_candle_event_flags(candle):
     """
     Checks the candle eventFlags and prints each active flag (used mainly for debugging purpose)
     """
-    if (candle.eventFlags & TX_PENDING) != 0:
-        print('TX_PENDING')
-    if (candle.eventFlags & REMOVE_EVENT) != 0:
-        print('REMOVE_EVENT')
-    if (candle.eventFlags & SNAPSHOT_BEGIN) != 0:
-        print('SNAPSHOT_BEGIN')
-    if (candle.eventFlags & SNAPSHOT_END) != 0:
-        print('SNAPSHOT_END')
-    if (candle.eventFlags & SNAPSHOT_SNIP) != 0:
-        print('SNAPSHOT_SNIP')
-    if (candle.eventFlags & SNAPSHOT_MODE) != 0:
-        print('SNAPSHOT_MODE')
+    flags = candle.eventFlags
+    for bit, name in FLAG_NAMES:
+        if flags & bit:
+            print(name)
 
 
 # I do not like any of the default styles, so here is a custom style
@@ -87,42 +124,149 @@ binance_dark = {
 }
 
 
-def candle_to_dataframe(candle):
-    """ Assuming 'candle' is your Candle object, function to convert a single Candle to DataFrame"""
-    try:
-        data_row = {
-            'eventSymbol': candle.eventSymbol,
-            'eventTime': candle.eventTime,
-            'eventFlags': candle.eventFlags,
-            'index': candle.index,
-            'time': datetime.fromtimestamp(candle.time / 1000),  # Convert to datetime
-            'sequence': candle.sequence,
-            'count': candle.count,
-            'open': float(candle.open),
-            'high': float(candle.high),
-            'low': float(candle.low),
-            'close': float(candle.close),
-            'volume': float(candle.volume),
-            'vwap': float(candle.vwap),
-            'bidVolume': float(candle.bidVolume) if candle.bidVolume is not None else None,
-            'askVolume': float(candle.askVolume) if candle.askVolume is not None else None,
-            'impVolatility': float(candle.impVolatility) if candle.impVolatility is not None else None,
-            'openInterest': candle.openInterest
-        }
-        df = pd.DataFrame([data_row])
-    except: # pylint: disable=bare-except
-        print("EXCEPT: candle_to_dataframe")
-        print(candle)
-        df = pd.DataFrame()
-
-    return df
-
-
-def vwap(df):
-    """ calculate periodic (start of dataset) volume weighted average price """
-    q = df.volume.values
-    p = df.vwap.values
-    return df.assign(periodic_vwap=(p * q).cumsum() / q.cumsum())
+class CandleBuffer:
+    """
+    Preallocated column store (one NumPy array per field) for the candles of a subscription.
+    Candles are upserted in O(1) via a dict mapping the candle time to its row, replacing the
+    former pd.concat/drop_duplicates/sort_values chain which was O(N) per candle.
+    The capacity is fixed: once full, a new candle overwrites the oldest one (circular buffer),
+    logical row 0 is stored at index start.
+    """
+    __slots__ = ('capacity', 'length', 'start', 'idx_map', 'needs_sort', 'open_', 'high', 'low', 'close', 'volume', 'vwap', 'time_ns')
+
+    def __init__(self, capacity=CANDLE_CAPACITY):
+        self.capacity = capacity
+        self.length = 0
+        self.start = 0  # array index of the oldest candle, stays 0 until the buffer is full
+        self.idx_map = {}  # time_ns -> array index
+        self.needs_sort = False  # set when a candle is appended before the last one (snapshot replay)
+        self.open_ = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.high = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.low = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.close = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.volume = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.vwap = np.empty(capacity, dtype=CANDLE_DTYPE)
+        self.time_ns = np.empty(capacity, dtype=np.int64)
+
+
+    def _columns(self):
+        return (self.open_, self.high, self.low, self.close, self.volume, self.vwap, self.time_ns)
+
+
+    def index(self, row):
+        """ array index of the logical row """
+        return (self.start + row) % self.capacity
+
+
+    def ordered(self, column):
+        """ the rows of column in logical (time) order, a view unless the buffer has wrapped around """
+        if self.start == 0:
+            return column[:self.length]
+        return np.concatenate((column[self.start:], column[:self.start]))
+
+
+    def upsert(self, candle):
+        """
+        insert the candle, or overwrite the row of a candle with the same time (keep last).
+        Returns the first logical row which changed (0 if the oldest candle was evicted, as all rows moved),
+        or None if nothing changed.
+        """
+        # open/high/low/close/volume/vwap are optional in the Candle event, skip candles which lack any of them
+        try:
+            open_ = float(candle.open)
+            high = float(candle.high)
+            low = float(candle.low)
+            close = float(candle.close)
+            volume = float(candle.volume)
+            vwap_ = float(candle.vwap)
+        except (AttributeError, TypeError, ValueError):
+            print("CandleBuffer.upsert: skipped incomplete candle")
+            print(candle)
+            return None
+
+        t_ns = int(candle.time) * 1_000_000
+        idx = self.idx_map.get(t_ns)
+        if idx is not None:
+            row = (idx - self.start) % self.capacity
+        elif self.length < self.capacity:
+            idx = row = self.length
+            if idx > 0 and t_ns < self.time_ns[idx - 1]:
+                self.needs_sort = True
+            self.length += 1
+            self.idx_map[t_ns] = idx
+        else:
+            # full: overwrite the oldest candle, the buffer has to be in time order to know which one that is
+            reordered = self.sort()
+            idx = self.start
+            if t_ns < self.time_ns[idx]:
+                # older than every buffered candle, but the sort may have moved all rows
+                return 0 if reordered else None
+            if t_ns < self.time_ns[idx - 1]:  # compare with the newest candle (index -1 wraps around)
+                self.needs_sort = True
+            del self.idx_map[int(self.time_ns[idx])]
+            self.idx_map[t_ns] = idx
+            self.start = (idx + 1) % self.capacity
+            row = 0
+
+        self.open_[idx] = open_
+        self.high[idx] = high
+        self.low[idx] = low
+        self.close[idx] = close
+        self.volume[idx] = volume
+        self.vwap[idx] = vwap_
+        self.time_ns[idx] = t_ns
+        return row
+
+
+    def sort(self):
+        """
+        sort rows by time, candles of a snapshot do not arrive in chronological order.
+        Live candles arrive in order, so this is a no-op unless an out of order candle was appended.
+        Returns True, if the rows were reordered.
+        """
+        if not self.needs_sort:
+            return False
+        self.needs_sort = False
+        n = self.length
+        order = np.argsort(self.ordered(self.time_ns), kind='stable')
+        for column in self._columns():
+            column[:n] = self.ordered(column)[order]
+        self.start = 0
+        self.idx_map = {int(t_ns): idx for idx, t_ns in enumerate(self.time_ns[:n])}
+        return True
+
+
+    def to_dataframe(self, **columns):
+        """
+        build the display DataFrame on top of the buffer arrays (no copy unless the buffer has wrapped around),
+        the index is converted to local time. Extra columns may be passed as keywords
+        """
+        index = pd.DatetimeIndex(self.ordered(self.time_ns).view('datetime64[ns]'), copy=False)
+        index = index.tz_localize('UTC').tz_convert(LOCAL_TZ).tz_localize(None)
+        return pd.DataFrame({
+            'open': self.ordered(self.open_),
+            'high': self.ordered(self.high),
+            'low': self.ordered(self.low),
+            'close': self.ordered(self.close),
+            'volume': self.ordered(self.volume),
+            'vwap': self.ordered(self.vwap),
+            **columns,
+        }, index=index, copy=False)
+
+
+@njit(cache=True)
+def vwap_append(p, q, start, end, cum_num, cum_den, out):
+    """
+    calculate periodic (start of dataset) volume weighted average price for the rows start..end-1 from the
+    price (candle vwap) and volume arrays, continuing the running sums cum_num/cum_den of the rows before start.
+    Writes the vwap into out and returns the updated running sums.
+    """
+    for i in range(start, end):
+        # accumulate in float64, also without numba (float32 + float stays float32 under NumPy 2 promotion)
+        cum_num += float(p[i]) * float(q[i])
+        cum_den += float(q[i])
+        out[i] = cum_num / cum_den if cum_den else np.nan  # leading zero volume candles have no vwap yet
+    return cum_num, cum_den
 
 
 def read_config():
@@ -131,30 +275,50 @@ def read_config():
     ToDo: Replace with encryped version, before production use. (This here is NOT safe to use, this is readable DEV stuff..)
     """
     try:
-        with open('tasty_tools_config.json', 'r', encoding="utf-8") as f:
-            config = json.load(f)
+        with open('tasty_tools_config.json', 'rb') as f:
+            config = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
             username = config.get('username')
             password = config.get('password')
             return username, password
     except FileNotFoundError:
         print("Config file not found.")
         return None, None
-    except json.JSONDecodeError:
+    except json.JSONDecodeError: # orjson.JSONDecodeError is a subclass
         print("Error decoding JSON from the config file.")
         return None, None
 
 
 class App:
     """Main application class"""
-    async def exec(self):
-        """Run the application"""
-        self.window = Window(asyncio.get_event_loop()) # pylint: disable=attribute-defined-outside-init
-        await self.window.display()
+    def exec(self):
+        """Run the application, Tk's mainloop drives the asyncio loop (see Window.pump_asyncio)"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # one streamer session for the lifetime of the application, Window only (re)subscribes on it
+        streamer = loop.run_until_complete(DXLinkStreamer.create(session))
+        self.window = Window(loop, streamer) # pylint: disable=attribute-defined-outside-init
+        main_task = loop.create_task(self.window.display())
+        main_task.add_done_callback(self.on_main_task_done)
+        try:
+            self.window.mainloop()
+            # quit() has cancelled the tasks, let them finish (re-raises, if the main task failed)
+            loop.run_until_complete(main_task)
+        finally:
+            loop.run_until_complete(streamer.close())
+            loop.close()
+            self.window.destroy()
+
+
+    def on_main_task_done(self, task):
+        """ leave the mainloop right away if the main task failed, instead of animating over a frozen chart """
+        if not task.cancelled() and task.exception() is not None:
+            print(f"EXCEPT: main task failed: {task.exception()!r}")
+            self.window.quit()
 
 
 class Window(tk.Tk):
     """Main Tk Window class, containing most of the functions to run the application"""
-    def __init__(self, loop):
+    def __init__(self, loop, streamer):
         super().__init__()
         # Sample initial data
         self.disp_df = pd.DataFrame({
@@ -165,6 +329,31 @@ class Window(tk.Tk):
             'volume': [1]
         }, index=pd.to_datetime(['2024-01-01']))
         self.loop = loop
+        # long-lived DXLinkStreamer (owned by App) and the candle subscriptions made on it
+        self.streamer = streamer
+        self._subscribed = set()  # (symbol, interval, start_time)
+        # periodic vwap per candle row and the running sums of the rows before _vwap_upto
+        self._vwap_out = np.empty(CANDLE_CAPACITY, dtype=CANDLE_DTYPE)
+        self._cum_num = 0.0
+        self._cum_den = 0.0
+        self._vwap_upto = 0
+        # artists of the chart which are drawn on top of the cached background (blitting)
+        self._bg = None
+        self._animated = []
+        self._wicks = None
+        self._bodies = None
+        self._vwap_line = None
+        self._volume_bar = None
+        self._plotted_len = 0
+        self._draw_scheduled = False
+        self._full_draw_pending = False
+        # candle store and redraw coalescing state
+        self.candles = CandleBuffer()
+        self._symbol = ""
+        self._dirty = False
+        self._dirty_from = 0  # first row changed since the last graph update
+        self._redraw_task = None
+        self._tasks = []
         self.run = True
         self.animation = "░▒▒▒▒▒"
         self.title('DXLinkStreamer')
@@ -192,6 +381,7 @@ class Window(tk.Tk):
         # Embed the mplfinance chart in the Tkinter window
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.draw()
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.grid(row=1, columnspan=2, sticky="nsew")
         self.canvas_widget.config(width=800, height=600)
@@ -200,106 +390,287 @@ class Window(tk.Tk):
         self.label.grid(row=2, columnspan=2, padx=(8, 8), pady=(4, 8))
         button_quit = tk.Button(text="Quit", width=10, command=self.quit)
         button_quit.grid(row=2, column=1, sticky="nse", padx=8, pady=(4, 8))
+        self.protocol("WM_DELETE_WINDOW", self.quit)
 
         self.update()
 
+        self.after(PUMP_INTERVAL_MS, self.pump_asyncio)
+        self.after(ANIMATION_INTERVAL_MS, self.animate)
+
+
+    def on_draw(self, _event):
+        """ cache the background after each full draw and draw the animated artists on top of it """
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+
+
+    def draw_animated(self):
+        """ draw the artists, which are excluded from the background """
+        for artist in self._animated:
+            self.fig.draw_artist(artist)
+
+
+    def plot_full(self):
+        """ slow path: clear the axes and plot the complete disp_df with mplfinance """
+        self.ax.clear()
+        if len(self.axlist) > 2:
+            volume_ax = self.axlist[2]
+            volume_ax.clear()
+        else:
+            volume_ax = None
+
+        disp_vwap = mpf.make_addplot(self.disp_df['periodic_vwap'], type='line', ax=self.ax, color='cyan', width=1, label="vwap")
+
+        mpf.plot(
+            self.disp_df,
+            type='candle',
+            style=binance_dark,
+            ax=self.ax,
+            volume=volume_ax,
+            columns=["open", "high", "low", "close", "volume"],
+            ylabel="Price ($)",
+            ylabel_lower="Volume",  addplot=disp_vwap, #update_width_config=dict(candle_linewidth=0.5, candle_width=0.5),
+        )
 
-    async def animation_async(self):
-        """async demo text animation"""
-        while self.run:
-            self.label["text"] = self.animation
-            self.animation = self.animation[1:] + self.animation[0]
-            self.update()
-            await asyncio.sleep(.1)
+        # keep references to the artists created by mplfinance, so the most recent candle can be updated in place.
+        # type='candle' adds a LineCollection (wicks) and a PolyCollection (bodies) to the axes.
+        self._wicks, self._bodies = self.ax.collections[-2:]
+        self._vwap_line = next(line for line in self.ax.lines if line.get_label() == "vwap")
+        self._animated = [self._wicks, self._bodies, self._vwap_line]
+        if volume_ax is not None:
+            self._volume_bar = volume_ax.patches[-1]
+            self._animated.append(self._volume_bar)
+        else:
+            self._volume_bar = None
+        for artist in self._animated:
+            artist.set_animated(True)
+        self._plotted_len = len(self.disp_df)
+        self._bg = None
+
+        self.schedule_draw(full=True)
+
+
+    def update_last_candle(self, periodic_vwap):
+        """
+        fast path: update the artists of the most recent candle in place and blit them onto the cached background.
+        Values are read straight from the candle buffer, no disp_df is needed.
+        Returns False, if a full redraw is needed instead (new candle, values outside of the current axis limits)
+        """
+        candles = self.candles
+        n = candles.length
+        if self._bg is None or n != self._plotted_len:
+            return False
+
+        i = candles.index(n - 1)
+        open_, high, low, close, volume = candles.open_[i], candles.high[i], candles.low[i], candles.close[i], candles.volume[i]
+        ymin, ymax = self.ax.get_ylim()
+        if low < ymin or high > ymax:
+            return False
+        if self._volume_bar is not None and volume > self._volume_bar.axes.get_ylim()[1]:
+            return False
+
+        wick_paths = self._wicks.get_paths()
+        body_paths = self._bodies.get_paths()
+        face_colors = self._bodies.get_facecolor()
+        edge_colors = self._bodies.get_edgecolor()
+        wick_colors = self._wicks.get_color()
+        if len(wick_paths) != 2 * n or len(body_paths) != n or not len(face_colors) == len(edge_colors) == len(wick_colors) == n:
+            return False
+
+        # mplfinance draws each candle as body (4 vertices) and two wick segments (rows i and n+i)
+        x = wick_paths[n - 1].vertices[0, 0]
+        x0 = body_paths[-1].vertices[:, 0].min()
+        x1 = body_paths[-1].vertices[:, 0].max()
+        body_paths[-1] = Path([(x0, open_), (x0, close), (x1, close), (x1, open_), (x0, open_)], closed=True)
+        wick_paths[n - 1] = Path([(x, low), (x, min(open_, close))])
+        wick_paths[2 * n - 1] = Path([(x, high), (x, max(open_, close))])
+
+        mc = binance_dark["marketcolors"]
+        updown = "up" if open_ < close else "down"
+        face_colors[-1] = to_rgba(mc["candle"][updown], mc["alpha"])
+        edge_colors[-1] = to_rgba(mc["edge"][updown])
+        wick_colors[-1] = to_rgba(mc["wick"][updown])
+        self._bodies.set_facecolor(face_colors)
+        self._bodies.set_edgecolor(edge_colors)
+        self._wicks.set_color(wick_colors)
+
+        if self._volume_bar is not None:
+            self._volume_bar.set_height(volume)
+            self._volume_bar.set_facecolor(mc["volume"][updown])
+            self._volume_bar.set_edgecolor(mc["vcedge"][updown])
+
+        self._vwap_line.set_ydata(periodic_vwap)
+
+        self.schedule_draw(full=False)
+        return True
+
+
+    def schedule_draw(self, full):
+        """
+        request a canvas update: full rasterization or blit of the animated artists.
+        All requests until Tk is idle are coalesced into one do_draw() call, a pending full draw includes the blit.
+        """
+        self._full_draw_pending |= full
+        if not self._draw_scheduled:
+            self._draw_scheduled = True
+            self.after_idle(self.do_draw)
+
+
+    def do_draw(self):
+        """ idle task: perform the scheduled canvas update """
+        self._draw_scheduled = False
+        if self._full_draw_pending or self._bg is None:
+            self._full_draw_pending = False
+            self.canvas.draw()  # already running as idle task, on_draw() caches the new background
+        else:
+            self.canvas.restore_region(self._bg)
+            self.draw_animated()
+            self.canvas.blit(self.fig.bbox)
+
+
+    def pump_asyncio(self):
+        """ run all ready asyncio callbacks once, then reschedule via Tk's after() """
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if self.run:
+            self.after(PUMP_INTERVAL_MS, self.pump_asyncio)
+
+
+    def animate(self):
+        """demo text animation"""
+        self.label["text"] = self.animation
+        self.animation = self.animation[1:] + self.animation[0]
+        if self.run:
+            self.after(ANIMATION_INTERVAL_MS, self.animate)
+
+
+    def store_candle(self, candle):
+        """ upsert the candle into the buffer and remember the first changed row """
+        row = self.candles.upsert(candle)
+        if row is not None:
+            self._dirty_from = min(self._dirty_from, row)
+
+
+    async def redraw_later(self):
+        """ coalesce all candles received within REDRAW_DELAY seconds into a single graph update """
+        await asyncio.sleep(REDRAW_DELAY)
+        self._redraw_task = None
+        if self._dirty:
+            self._dirty = False
+            self.redraw()
+
+
+    def update_vwap(self):
+        """
+        volume weighted average price (vwap) of all candles, only the rows changed since the last call are computed.
+        The running sums are kept up to the second to last row, the most recent candle is still forming.
+        """
+        candles = self.candles
+        n = candles.length
+        if self._dirty_from < self._vwap_upto:
+            # an older row changed (snapshot) or the oldest candle was evicted, start over
+            self._cum_num, self._cum_den, self._vwap_upto = 0.0, 0.0, 0
+
+        p = candles.ordered(candles.vwap)
+        q = candles.ordered(candles.volume)
+        self._cum_num, self._cum_den = vwap_append(p, q, self._vwap_upto, n - 1, self._cum_num, self._cum_den, self._vwap_out)
+        self._vwap_upto = n - 1
+        vwap_append(p, q, n - 1, n, self._cum_num, self._cum_den, self._vwap_out)
+        return self._vwap_out[:n]
+
+
+    def redraw(self):
+        """ update vwap, chart and labels from the candle buffer """
+        candles = self.candles
+        # a live candle may have arrived out of order, sort() is a no-op otherwise
+        if candles.sort():
+            self._dirty_from = 0
+        n = candles.length
+        periodic_vwap = self.update_vwap()
+
+        # only the most recent candle changed: update its artists in place and blit,
+        # otherwise (new candle, snapshot, y-axis rescale) redraw the whole chart
+        if (self._dirty_from < n - 1) or not self.update_last_candle(periodic_vwap):
+            # mplfinance only reads from disp_df, so it may alias the buffer arrays (no deep copy, no set_index)
+            self.disp_df = candles.to_dataframe(periodic_vwap=periodic_vwap)
+            self.plot_full()
+        self._dirty_from = n
+
+        # use the last row to get close and periodic_vwap of the most recent candle, float with 2 decimal places
+        self.label_quote["text"] = f"{self._symbol} {candles.close[candles.index(n - 1)]:.2f}"
+        self.label_vwap["text"] = f"vwap {periodic_vwap[-1]:.2f}"
+
+
+    async def subscribe_candles(self, symbols, interval, start_time):
+        """ subscribe to the candles of all symbols, which are not subscribed with the same interval/start_time yet """
+        new_symbols = [symbol for symbol in symbols if (symbol, interval, start_time) not in self._subscribed]
+        if new_symbols:
+            await self.streamer.subscribe_candle(symbols=new_symbols, interval=interval, start_time=start_time, extended_trading_hours=False)
+            self._subscribed.update((symbol, interval, start_time) for symbol in new_symbols)
 
 
     async def get_candle_async(self):
         """get candle from DXLinkStreamer and display graphic"""
-        async with DXLinkStreamer(session) as streamer:
-            subs_list = ['SPY']  # list of symbols to subscribe to ['SPY','/ES:XCME','GDX']
-            #epoch = datetime(2024, 12, 6, 0, 0, 0)
-            # Get today's date at midnight
-            epoch = datetime.combine(datetime.today().date(), datetime.min.time())
-            #print(epoch.isoformat())
-
-            await streamer.subscribe_candle(symbols=subs_list, interval="5m", start_time = epoch, extended_trading_hours=False)
-
-            df = pd.DataFrame()
-            update_graph = False
-
-            while self.run:
-                try:
-                    candle = await asyncio.wait_for(streamer.get_event(Candle), timeout=2.0)
-                    #print(candle)
-                    #check_candle_event_flags(candle)
-
-                    if (candle.eventFlags & SNAPSHOT_BEGIN) != 0:
-                        update_graph = False
-
-                    if (candle.eventFlags & SNAPSHOT_END) != 0:
-                        update_graph = True
-
-                    if (candle.eventFlags & REMOVE_EVENT) == 0: # if this is not a remove event, process the candle
-                        df_new = candle_to_dataframe(candle)
-                        if not df_new.empty:
-                            df = pd.concat([df, df_new], axis=0, ignore_index=True)
-                            df.drop_duplicates(subset=['time'], keep='last', inplace=True)
-                            df.sort_values(by=['time'], inplace=True)
-
-                    if update_graph & (not df.empty):
-                        self.disp_df = df.copy(deep=True)
-                        self.disp_df.set_index('time', inplace=True)
-
-                        # Clear the axes
-                        self.ax.clear()
-                        if len(self.axlist) > 2:
-                            volume_ax = self.axlist[2]
-                            volume_ax.clear()
-                        else:
-                            volume_ax = None
-
-                        #volume weighted average price (vwap)
-                        self.disp_df = vwap(self.disp_df)
-                        disp_vwap = mpf.make_addplot(self.disp_df['periodic_vwap'], type='line', ax=self.ax, color='cyan', width=1, label="vwap")
-
-                        mpf.plot(
-                            self.disp_df,
-                            type='candle',
-                            style=binance_dark,
-                            ax=self.ax,
-                            volume=volume_ax,
-                            columns=["open", "high", "low", "close", "volume"],
-                            ylabel="Price ($)",
-                            ylabel_lower="Volume",  addplot=disp_vwap, #update_width_config=dict(candle_linewidth=0.5, candle_width=0.5),
-                        )
-
-                        self.canvas.draw()
-
-                        # use last row of dataframe to get close and periodic_vwap of the most recent candle, float with 2 decimal places
-                        self.label_quote["text"] = f"{candle.eventSymbol} {self.disp_df['close'].iat[-1]:.2f}"
-                        self.label_vwap["text"] = f"vwap {self.disp_df['periodic_vwap'].iat[-1]:.2f}"
-
-                        self.update()
-
-                    await asyncio.sleep(0)
-                except TimeoutError:
-                    #print("DEBUG: get_event(Candle) : timeout")
-                    await asyncio.sleep(0)
-
-            await streamer.close()
+        subs_list = ['SPY']  # list of symbols to subscribe to ['SPY','/ES:XCME','GDX']
+        #epoch = datetime(2024, 12, 6, 0, 0, 0)
+        # Get today's date at midnight
+        epoch = datetime.combine(datetime.today().date(), datetime.min.time())
+        #print(epoch.isoformat())
+
+        await self.subscribe_candles(subs_list, "5m", epoch)
+
+        update_graph = False
+
+        # listen() waits on the streamer's queue without a timeout, quit() ends the loop by cancelling the task
+        async for candle in self.streamer.listen(Candle):
+            if not self.run:
+                break
+            #print(candle)
+            #check_candle_event_flags(candle)
+
+            flags = candle.eventFlags & SNAPSHOT_MASK
+            if flags == 0: # live candle, just store it
+                self.store_candle(candle)
+            else:
+                if flags & SNAPSHOT_BEGIN:
+                    update_graph = False
+                    self._dirty = False  # a pending redraw must not show a partial snapshot
+
+                if not flags & REMOVE_EVENT: # if this is not a remove event, process the candle
+                    self.store_candle(candle)
+
+                if flags & SNAPSHOT_END:
+                    if self.candles.sort():
+                        self._dirty_from = 0
+                    update_graph = True
+
+            # no redraw during snapshot replay, the graph is updated once the snapshot has ended
+            if update_graph & (self.candles.length > 0):
+                self._symbol = candle.eventSymbol
+                self._dirty = True
+                if self._redraw_task is None:
+                    self._redraw_task = asyncio.create_task(self.redraw_later())
 
 
     def quit(self):
         self.run = False
+        # cancel the tasks explicitly, get_candle_async() is waiting for the next candle
+        for task in self._tasks:
+            task.cancel()
+        if self._redraw_task is not None:
+            self._redraw_task.cancel()
+        super().quit()  # leave Tk's mainloop
 
 
     async def display(self):
         """async main loop"""
-        while self.run:
-            await asyncio.gather(
-                self.animation_async(),
-                self.get_candle_async(),
-            )
+        self._tasks = [
+            asyncio.create_task(self.get_candle_async()),
+        ]
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
 
 # Disabled for demo purpose
 
@@ -309,4 +680,4 @@ class Window(tk.Tk):
 # This is for demo purpose only!! NEVER store username/password in sourcecode! Else they might end up on Github :-(
 session = Session('your_TTuser_name', 'your_TTpassword') # username, password
 
-asyncio.run(App().exec())
+App().exec()